@@ -2,11 +2,24 @@ import os
 import json
 import re
 import uuid
+import zlib
+import bisect
+import operator
 import threading
 import src.parser as parser
 import src.readwritelocks as ReadWriteLock
 from threading import Lock
 
+WHERE_OPERATORS = {
+    "eq": operator.eq,
+    "gt": operator.gt,
+    "lt": operator.lt
+}
+
+TEXT_OPERATORS = ("like", "match")
+
+INDEX_KINDS = ("hash", "text")
+
 class SimpleDB:
     def __init__(self, db_file):
         self.db_file = db_file
@@ -20,6 +33,8 @@ class SimpleDB:
         
         self.tables = {}
         self.indexes = {}
+        self.text_indexes = {}
+        self.schemas = {}
         self.in_commit = False
         self.in_transaction = False
         self.locks = {}
@@ -27,8 +42,12 @@ class SimpleDB:
         self.thread_local = threading.local()
         self.metadata_lock = Lock()
         self.save_lock = Lock()
+        self.snapshot_lock = Lock()
+        self.snapshot_version = 0
+        self.saved_version = 0
         self.row_locks = {}
         self.table_locks = {}
+        self.partition_locks = {}
         
     @property
     def current_transaction_log(self):
@@ -46,34 +65,56 @@ class SimpleDB:
         
     def commit(self):
         """
-        Apply all logged operations to the database and clear the log
+        Apply all logged operations to the database and clear the log.
+        If any operation fails, the ones already applied are undone.
         """
         if not hasattr(self.thread_local, 'in_transaction') or not self.thread_local.in_transaction:
             raise RuntimeError("No transaction in progress in this thread.")
         
         try:
-            tables_involved = set(op["table"] for op in self.thread_local.transaction_log)
-            locks = [self._get_table_lock(table) for table in sorted(tables_involved)]
-            for lock in locks:
-                lock.acquire_write()
+            ops = [self._prepare_op(op) for op in self.thread_local.transaction_log]
+            keys = [key for op in ops for key in self._lock_keys(op)]
+            locks = self._acquire_write(keys)
+            undo_log = []
             try:
-                for op in self.thread_local.transaction_log:
+                for op in ops:
                     table = op["table"]
                     if op["type"] == "insert":
-                        self._commit_insert(table, op["row"])
+                        self._store_rows(table, op["row"], undo_log)
                     elif op["type"] == "update":
-                        self._commit_update(table, op["set_values"], op.get("where"))
+                        self._commit_update(table, op["set_values"], op.get("where"), undo_log)
                     elif op["type"] == "delete":
-                        self._commit_delete(table, op.get("where"))
-                        
-                self.save()
+                        self._commit_delete(table, op.get("where"), undo_log)
+            except Exception:
+                self._undo(undo_log)
+                raise
             finally:
                 for lock in locks:
                     lock.release_write()
+            self.save()
         finally:
             self.thread_local.transaction_log = []
             self.thread_local.in_transaction = False
     
+    def _undo(self, undo_log: list) -> None:
+        """
+        Reverts partially applied operations, newest first, and rebuilds the
+        indexes of every partition they touched.
+        """
+        touched = set()
+        for entry in reversed(undo_log):
+            partition = self._partition(entry["table"], entry["pid"])
+            if entry["type"] == "truncate":
+                del partition["rows"][entry["length"]:]
+            elif entry["type"] == "rows":
+                partition["rows"] = entry["rows"]
+            elif entry["type"] == "values":
+                entry["row"].update(entry["values"])
+            touched.add((entry["table"], entry["pid"]))
+        
+        for table_name, pid in touched:
+            self._rebuild_indexes(table_name, pid)
+    
     def rollback(self):
         """
         Discard all operations in current transaction.
@@ -84,40 +125,122 @@ class SimpleDB:
         self.thread_local.transaction_log = []
         self.thread_local.in_transaction = False
 
-    def create_index(self, table_name, column):
+    def create_index(self, table_name, column, kind="hash"):
         """
         Create an index for columns to make searching more efficient.
+        Partitioned tables get one index per partition.
+        
+        "hash" indexes serve 'eq' lookups. "text" indexes keep the sorted
+        values and word tokens of a string column to serve LIKE 'abc%' and
+        MATCH lookups.
         """
+        if kind not in INDEX_KINDS:
+            raise ValueError(f"Index kind must be one of {', '.join(INDEX_KINDS)}")
         with self.metadata_lock:
             if table_name not in self.tables:
                 raise ValueError("Table does not exist.")
-            with self._get_lock(table_name):            
-                self.indexes.setdefault(table_name, {})[column] = {}
+            if kind == "text" and self.tables[table_name]["schema"].get(column, {}).get("type") not in (None, "TEXT"):
+                raise ValueError("Text indexes need a TEXT or untyped column")
+            with self._get_lock(table_name):
+                store = self._index_store(kind).setdefault(table_name, {})
+                pids = self._partition_ids(table_name)
+                if pids != [None] and column not in store:
+                    # Partitions without an index yet are scanned instead.
+                    store[column] = [None for _ in pids]
                 
-                for i, row in enumerate(self.tables[table_name]["rows"]):
-                    val = row[column]
-                    self.indexes[table_name][column].setdefault(val, []).append(i)
+                for pid in pids:
+                    lock = self._get_partition_lock(table_name, pid)
+                    lock.acquire_write()
+                    try:
+                        index = self._build_index(self._partition(table_name, pid)["rows"], column, kind)
+                        if pid is None:
+                            store[column] = index
+                        else:
+                            store[column][pid] = index
+                    finally:
+                        lock.release_write()
         
     def save(self):
         """
         Save new data to json file.
+        
+        Copies every partition under its read lock so the file never holds a
+        half-applied commit, then writes the copy without holding any
+        partition lock. Callers must release their partition locks first.
         """
+        tables = list(self.tables.items())
+        keys = [(table_name, pid) for table_name, _ in tables for pid in self._partition_ids(table_name)]
+        locks = self._acquire_read(keys)
+        try:
+            snapshot = {table_name: self._snapshot_table(table) for table_name, table in tables}
+            with self.snapshot_lock:
+                self.snapshot_version += 1
+                version = self.snapshot_version
+        finally:
+            for lock in locks:
+                lock.release_read()
+        
         with self.save_lock:
-            with open(self.db_file, 'w') as f:
-                json.dump(self.tables, f)
+            # A newer snapshot may already be on disk.
+            if version > self.saved_version:
+                with open(self.db_file, 'w') as f:
+                    json.dump(snapshot, f)
+                self.saved_version = version
+    
+    def _snapshot_table(self, table: dict) -> dict:
+        snapshot = dict(table)
+        if "partitions" in table:
+            snapshot["partitions"] = [{"rows": [dict(row) for row in partition["rows"]]} for partition in table["partitions"]]
+        else:
+            snapshot["rows"] = [dict(row) for row in table["rows"]]
+        return snapshot
         
-    def create_table(self, table_name: str, columns: list):
+    def create_table(self, table_name: str, columns: list, partition_by: dict = None):
         """
         Create new a new table. Duh...
+        
+        Columns are declared as "name [INT | FLOAT | TEXT | BOOL] [NOT NULL]
+        [PRIMARY KEY | UNIQUE]". A bare name is an untyped, nullable column.
+        Validators and where comparators are compiled here once per table,
+        and PRIMARY KEY/UNIQUE columns get an automatic hash index.
+        
+        partition_by splits the rows into partitions that each have their own
+        rows, indexes and lock:
+            {"type": "hash", "column": "id", "count": 4}
+            {"type": "range", "column": "age", "bounds": [18, 65]}
+        Range partition i holds values in [bounds[i - 1], bounds[i]).
         """
         with self.metadata_lock:
             if table_name in self.tables:
                 raise ValueError("Table already exists")
             
-            self.tables[table_name] = {
+            declarations = [parser.parse_column(column) for column in columns]
+            columns = [column["name"] for column in declarations]
+            unique = [column["name"] for column in declarations if column["unique"]]
+            if sum(column["primary_key"] for column in declarations) > 1:
+                raise ValueError("Table can only have one primary key")
+            
+            table = {
                 "columns": columns,
-                "rows": []
+                "schema": {column.pop("name"): column for column in declarations}
             }
+            if partition_by is None:
+                table["rows"] = []
+            else:
+                self._validate_partition_spec(columns, partition_by)
+                if any(column != partition_by["column"] for column in unique):
+                    raise ValueError("Unique columns of a partitioned table must be the partition column")
+                if partition_by["type"] == "hash":
+                    count = partition_by["count"]
+                else:
+                    count = len(partition_by["bounds"]) + 1
+                table["partition_by"] = partition_by
+                table["partitions"] = [{"rows": []} for _ in range(count)]
+            
+            self.tables[table_name] = table
+            self.schemas[table_name] = self._compile_schema(table["schema"])
+            for column in unique:
+                self.indexes.setdefault(table_name, {})[column] = self._new_index(table_name)
             self.save()
         
     def insert(self, table_name: str, rows: list):
@@ -127,63 +250,97 @@ class SimpleDB:
         if hasattr(self.thread_local, 'in_transaction') and self.thread_local.in_transaction:
             self.thread_local.transaction_log.append({"type": "insert", "table": table_name, "row": rows})
         else:
-            lock = self._get_table_lock(table_name)
-            lock.acquire_write()
+            rows = self._prepare_rows(table_name, rows)
+            locks = self._acquire_write(self._lock_keys({"type": "insert", "table": table_name, "row": rows}))
+            undo_log = []
             try:
-                self._commit_insert(table_name, rows)
-                self.save()
+                self._store_rows(table_name, rows, undo_log)
+            except Exception:
+                self._undo(undo_log)
+                raise
             finally:
-                lock.release_write()
+                for lock in locks:
+                    lock.release_write()
+            self.save()
 
     def _commit_insert(self, table_name: str, rows: list) -> None | ValueError | RuntimeError:
         """
         Inserts values into table from transaction log once committed.
         """
+        self._store_rows(table_name, self._prepare_rows(table_name, rows))
+    
+    def _prepare_rows(self, table_name: str, rows: list) -> list | ValueError | RuntimeError:
+        """
+        Validates new rows and aligns them to the table schema.
+        """
         if table_name not in self.tables:
             raise ValueError("Table does not exist")
         
         table = self.tables[table_name]
+        schema = self.schemas[table_name]
         
         if not isinstance(rows, list):
             raise RuntimeError("Rows are not of type list")
-        else:
-            for row in rows:
-                if not set(row.keys()).issubset(set(table["columns"])) or len(row.keys()) == 0:
-                    raise ValueError("Row does not match table schema")
-                
-                row = self._update_with_real_keys(row, table["columns"])
+        
+        result = []
+        for row in rows:
+            if not row.keys() <= schema["columns"] or len(row.keys()) == 0:
+                raise ValueError("Row does not match table schema")
+            
+            row = self._update_with_real_keys(row, table["columns"])
+            if schema["generate_id"]:
                 row = self._set_row_id(row)
-                row = self._align_row_to_schema(table_name, row)
-                
-                table["rows"].append(row)
+            row = self._align_row_to_schema(table_name, row)
+            
+            for column, validate in schema["validators"].items():
+                validate(row[column])
+            
+            result.append(row)
+        return result
+    
+    def _store_rows(self, table_name: str, rows: list, undo_log: list = None) -> None:
+        """
+        Appends prepared rows to their partitions and indexes them.
+        """
+        placed = [(self._partition_for_row(table_name, row), row) for row in rows]
+        
+        for column in self.schemas[table_name]["unique"]:
+            seen = set()
+            for pid, row in placed:
+                value = row[column]
+                if value is None:
+                    continue
+                if value in seen or value in self._index_for(table_name, column, pid):
+                    raise ValueError(f"Duplicate value for unique column '{column}'")
+                seen.add(value)
+        
+        if undo_log is not None:
+            for pid in set(pid for pid, _ in placed):
+                length = len(self._partition(table_name, pid)["rows"])
+                undo_log.append({"type": "truncate", "table": table_name, "pid": pid, "length": length})
+        
+        for pid, row in placed:
+            partition = self._partition(table_name, pid)
+            partition["rows"].append(row)
+            self._index_row(table_name, pid, len(partition["rows"]) - 1, row)
     
     def select(self, table_name: str, columns: list, where=None):
         if table_name not in self.tables:
             raise ValueError("Table does not exist")
-        lock = self._get_table_lock(table_name)
-        lock.acquire_read()
+        matches = self._compile_where(table_name, where)
+        pids = self._prune_partitions(table_name, where)
+        locks = self._acquire_read([(table_name, pid) for pid in pids])
         try:
-            if where and table_name in self.indexes:
-                for col, cond in where.items():
-                    if col in self.indexes[table_name] and "eq" in cond:
-                        indices = self.indexes[table_name][col].get(cond["eq"], [])
-                        rows = [self.tables[table_name]["rows"][i] for i in indices]
-                        if columns == ["*"]:
-                            return rows
-                        else:
-                            return [{c: row[c] for c in columns} for row in rows]
+            rows = []
+            for pid in pids:
+                rows.extend(self._scan_partition(table_name, pid, where, matches))
+            if columns == ["*"]:
+                return rows
             else:
-                table = self.tables[table_name]
-                rows = table["rows"]
-                
-                if where:
-                    rows = [row for row in rows if self._apply_where(row, where)]
-                if columns == ["*"]:
-                    return rows
-                else:
-                    return [{col: row[col] for col in columns} for row in rows]
+                return [{col: row[col] for col in columns} for row in rows]
         finally:
-            lock.release_read()
+            for lock in locks:
+                lock.release_read()
 
     def update(self, table_name, set_values, where=None) -> None:
         """
@@ -195,24 +352,80 @@ class SimpleDB:
         if hasattr(self.thread_local, 'in_transaction') and self.thread_local.in_transaction:
             self.thread_local.transaction_log.append({"type": "update", "table": table_name, "set_values": set_values, "where": where})
         else:
-            lock = self._get_table_lock(table_name)
-            lock.acquire_write()
+            locks = self._acquire_write(self._lock_keys({"type": "update", "table": table_name, "set_values": set_values, "where": where}))
+            undo_log = []
             try:
-                self._commit_update(table_name, set_values, where)
-                self.save()
+                self._commit_update(table_name, set_values, where, undo_log)
+            except Exception:
+                self._undo(undo_log)
+                raise
             finally:
-                lock.release_write()
+                for lock in locks:
+                    lock.release_write()
+            self.save()
                 
 
-    def _commit_update(self, table_name, set_values, where=None):
+    def _commit_update(self, table_name, set_values, where=None, undo_log=None):
         if table_name not in self.tables:
             raise ValueError("Table does not exist")
         
-        table = self.tables[table_name]
+        schema = self.schemas[table_name]
+        if not set_values.keys() <= schema["columns"]:
+            raise ValueError("Row does not match table schema")
+        for column, value in set_values.items():
+            if column in schema["validators"]:
+                schema["validators"][column](value)
+        
+        matches = self._compile_where(table_name, where)
+        touched = self._prune_partitions(table_name, where)
+        matched = []
+        for pid in touched:
+            for row in self._partition(table_name, pid)["rows"]:
+                if not matches or matches(row):
+                    matched.append((pid, row))
+        
+        self._check_unique_update(table_name, set_values, matched)
         
-        for i, row in enumerate(table["rows"]):
-            if not where or self._apply_where(row, where):
-                table["rows"][i].update(set_values)
+        spec = self.tables[table_name].get("partition_by")
+        retext = any(column in set_values for column in self.text_indexes.get(table_name, {})) \
+            or (spec is not None and spec["column"] in set_values)
+        
+        # Placing the updated rows can fail, so do it before any row changes.
+        targets = [self._partition_for_row(table_name, {**row, **set_values}) for _, row in matched]
+        
+        moved = []
+        for (pid, row), target in zip(matched, targets):
+            if undo_log is not None:
+                old_values = {column: row[column] for column in set_values}
+                undo_log.append({"type": "values", "table": table_name, "pid": pid, "row": row, "values": old_values})
+            if retext:
+                self._unindex_text(table_name, pid, row)
+            row.update(set_values)
+            if retext:
+                self._index_text(table_name, target, row)
+            if target != pid:
+                moved.append((pid, target, row))
+        
+        # Rows whose partition column changed belong to another partition now.
+        leaving = {id(row) for _, _, row in moved}
+        for source in set(source for source, _, _ in moved):
+            partition = self._partition(table_name, source)
+            if undo_log is not None:
+                undo_log.append({"type": "rows", "table": table_name, "pid": source, "rows": partition["rows"]})
+            partition["rows"] = [row for row in partition["rows"] if id(row) not in leaving]
+        for target in set(target for _, target, _ in moved):
+            if undo_log is not None:
+                length = len(self._partition(table_name, target)["rows"])
+                undo_log.append({"type": "truncate", "table": table_name, "pid": target, "length": length})
+        for _, target, row in moved:
+            self._partition(table_name, target)["rows"].append(row)
+        
+        # Hash indexes hold row positions, which moves shift.
+        rehash = set(pid for source, target, _ in moved for pid in (source, target))
+        if any(column in set_values for column in self.indexes.get(table_name, {})):
+            rehash |= set(pid for pid, _ in matched)
+        for pid in rehash:
+            self._rebuild_indexes(table_name, pid, ["hash"])
                     
     def delete(self, table_name, where=None) -> None | ValueError | TypeError:
         """
@@ -224,24 +437,44 @@ class SimpleDB:
         if hasattr(self.thread_local, 'in_transaction') and self.thread_local.in_transaction:
             self.thread_local.transaction_log.append({"type": "delete", "table": table_name, "where": where})
         else:
-            lock = self._get_table_lock(table_name)
-            lock.acquire_write()
+            locks = self._acquire_write(self._lock_keys({"type": "delete", "table": table_name, "where": where}))
+            undo_log = []
             try:
-                self._commit_delete(table_name, where)
-                self.save()
+                self._commit_delete(table_name, where, undo_log)
+            except Exception:
+                self._undo(undo_log)
+                raise
             finally:
-                lock.release_write()
+                for lock in locks:
+                    lock.release_write()
+            self.save()
         
-    def _commit_delete(self, table_name, where=None):
+    def _commit_delete(self, table_name, where=None, undo_log=None):
         if table_name not in self.tables:
             raise ValueError("Table does not exist")
         
-        table = self.tables[table_name]
-        
-        if not where:
-            table["rows"] = []
-        else:
-            table["rows"] = [row for row in table["rows"] if not self._apply_where(row, where)]    
+        matches = self._compile_where(table_name, where)
+        for pid in self._prune_partitions(table_name, where):
+            partition = self._partition(table_name, pid)
+            if where:
+                kept = [row for row in partition["rows"] if not matches(row)]
+            else:
+                kept = []
+            if len(kept) == len(partition["rows"]):
+                continue
+            
+            if undo_log is not None:
+                undo_log.append({"type": "rows", "table": table_name, "pid": pid, "rows": partition["rows"]})
+            if kept:
+                keeping = {id(row) for row in kept}
+                for row in partition["rows"]:
+                    if id(row) not in keeping:
+                        self._unindex_text(table_name, pid, row)
+                partition["rows"] = kept
+                self._rebuild_indexes(table_name, pid, ["hash"])
+            else:
+                partition["rows"] = kept
+                self._rebuild_indexes(table_name, pid)
     
     def execute(self, query_str):
         """
@@ -275,7 +508,386 @@ class SimpleDB:
         if table_name not in self.table_locks:
             self.table_locks[table_name] = ReadWriteLock.ReadWriteLock()
         return self.table_locks[table_name]
+    
+    def _get_partition_lock(self, table_name, pid):
+        """
+        Unpartitioned tables (pid None) share the table lock.
+        """
+        if pid is None:
+            return self._get_table_lock(table_name)
+        return self.partition_locks.setdefault((table_name, pid), ReadWriteLock.ReadWriteLock())
+    
+    def _sorted_locks(self, keys) -> list:
+        """
+        Orders (table, pid) lock keys so every thread acquires them in the same order.
+        """
+        keys = sorted(set(keys), key=lambda key: (key[0], -1 if key[1] is None else key[1]))
+        return [self._get_partition_lock(table_name, pid) for table_name, pid in keys]
+    
+    def _acquire_write(self, keys) -> list:
+        locks = self._sorted_locks(keys)
+        for lock in locks:
+            lock.acquire_write()
+        return locks
+    
+    def _acquire_read(self, keys) -> list:
+        locks = self._sorted_locks(keys)
+        for lock in locks:
+            lock.acquire_read()
+        return locks
+    
+    def _prepare_op(self, op: dict) -> dict:
+        """
+        Aligns logged insert rows before commit so their partitions are known.
+        """
+        if op["type"] == "insert":
+            return dict(op, row=self._prepare_rows(op["table"], op["row"]))
+        return op
+    
+    def _lock_keys(self, op: dict) -> list:
+        """
+        Returns the (table, pid) locks an operation needs.
+        """
+        table_name = op["table"]
+        if op["type"] == "insert":
+            return [(table_name, self._partition_for_row(table_name, row)) for row in op["row"]]
         
+        spec = self.tables.get(table_name, {}).get("partition_by")
+        if op["type"] == "update" and spec and spec["column"] in op["set_values"]:
+            # Updated rows may move to any partition.
+            return [(table_name, pid) for pid in self._partition_ids(table_name)]
+        return [(table_name, pid) for pid in self._prune_partitions(table_name, op.get("where"))]
+    
+    def _validate_partition_spec(self, columns: list, spec: dict) -> None | ValueError:
+        if spec.get("column") not in columns:
+            raise ValueError("Partition column is not in table schema")
+        if spec.get("type") == "hash":
+            if not isinstance(spec.get("count"), int) or spec["count"] < 1:
+                raise ValueError("Hash partitioning needs a positive partition count")
+        elif spec.get("type") == "range":
+            bounds = spec.get("bounds")
+            if not isinstance(bounds, list) or bounds != sorted(bounds):
+                raise ValueError("Range partitioning needs a sorted list of bounds")
+        else:
+            raise ValueError("Partition type must be 'hash' or 'range'")
+    
+    def _partition_ids(self, table_name) -> list:
+        if table_name not in self.tables:
+            raise ValueError("Table does not exist")
+        table = self.tables[table_name]
+        if "partition_by" not in table:
+            return [None]
+        return list(range(len(table["partitions"])))
+    
+    def _partition(self, table_name, pid) -> dict:
+        """
+        Returns the dict holding a partition's rows. Unpartitioned tables are their own partition.
+        """
+        table = self.tables[table_name]
+        if pid is None:
+            return table
+        return table["partitions"][pid]
+    
+    def _partition_for_value(self, spec: dict, value) -> int | ValueError:
+        if spec["type"] == "hash":
+            # 1 and 1.0 compare equal, so they have to hash to the same partition.
+            if isinstance(value, float) and value.is_integer():
+                value = int(value)
+            # crc32 rather than hash() so placement is stable across processes.
+            return zlib.crc32(json.dumps(value).encode()) % spec["count"]
+        if value is None:
+            raise ValueError("Range partition column cannot be null")
+        try:
+            return bisect.bisect_right(spec["bounds"], value)
+        except TypeError:
+            raise TypeError("Range partition value is not comparable with the bounds") from None
+    
+    def _partition_for_row(self, table_name, row: dict) -> int | None:
+        if table_name not in self.tables:
+            raise ValueError("Table does not exist")
+        spec = self.tables[table_name].get("partition_by")
+        if spec is None:
+            return None
+        return self._partition_for_value(spec, row[spec["column"]])
+    
+    def _prune_partitions(self, table_name, where=None) -> list:
+        """
+        Returns the partitions a where clause can match.
+        """
+        pids = self._partition_ids(table_name)
+        spec = self.tables[table_name].get("partition_by")
+        if spec is None or not where or spec["column"] not in where:
+            return pids
+        
+        low, high = 0, len(pids) - 1
+        for op, value in where[spec["column"]].items():
+            if op == "eq":
+                pid = self._partition_for_value(spec, value)
+                low, high = max(low, pid), min(high, pid)
+            elif spec["type"] == "range" and op == "gt":
+                low = max(low, bisect.bisect_right(spec["bounds"], value))
+            elif spec["type"] == "range" and op == "lt":
+                high = min(high, bisect.bisect_right(spec["bounds"], value))
+        return pids[low:high + 1]
+    
+    def _scan_partition(self, table_name, pid, where=None, matches=None) -> list:
+        """
+        Returns matching rows of one partition, using an index when one fits the where clause.
+        """
+        rows = self._partition(table_name, pid)["rows"]
+        if where:
+            candidates = self._index_candidates(table_name, pid, where)
+            if candidates is not None:
+                rows = candidates
+            rows = [row for row in rows if matches(row)]
+        return rows
+    
+    def _index_candidates(self, table_name, pid, where) -> list | None:
+        """
+        Returns the rows an index narrows the where clause down to, or None
+        when no index applies.
+        """
+        for col, cond in where.items():
+            index = self._index_for(table_name, col, pid)
+            if index is not None and "eq" in cond:
+                rows = self._partition(table_name, pid)["rows"]
+                return [rows[i] for i in index.get(cond["eq"], [])]
+        
+        for col, cond in where.items():
+            index = self._index_for(table_name, col, pid, "text")
+            if index is None:
+                continue
+            if isinstance(cond.get("like"), str):
+                prefix = cond["like"].rstrip("%")
+                if "%" not in prefix and "_" not in prefix:
+                    return self._prefix_rows(index, prefix, exact=not cond["like"].endswith("%"))
+            if isinstance(cond.get("match"), str):
+                return self._token_rows(index, cond["match"])
+        return None
+    
+    def _prefix_rows(self, index, prefix, exact=False) -> list:
+        if exact:
+            return list(index["values"].get(prefix, {}).values())
+        rows = []
+        keys = index["keys"]
+        i = bisect.bisect_left(keys, prefix)
+        while i < len(keys) and keys[i].startswith(prefix):
+            rows.extend(index["values"][keys[i]].values())
+            i += 1
+        return rows
+    
+    def _token_rows(self, index, text) -> list:
+        postings = [index["tokens"].get(token, {}) for token in set(self._tokens(text))]
+        postings.sort(key=len)
+        return [row for key, row in postings[0].items() if all(key in other for other in postings[1:])]
+    
+    def _tokens(self, text) -> list:
+        return re.findall(r"\w+", text.lower())
+    
+    def _index_store(self, kind="hash") -> dict:
+        return self.text_indexes if kind == "text" else self.indexes
+    
+    def _new_index(self, table_name):
+        pids = self._partition_ids(table_name)
+        if pids == [None]:
+            return {}
+        return [{} for _ in pids]
+    
+    def _index_for(self, table_name, column, pid, kind="hash") -> dict | None:
+        index = self._index_store(kind).get(table_name, {}).get(column)
+        if index is None or pid is None:
+            return index
+        return index[pid]
+    
+    def _index_row(self, table_name, pid, position, row) -> None:
+        for column in self.indexes.get(table_name, {}):
+            index = self._index_for(table_name, column, pid)
+            if index is not None:
+                index.setdefault(row[column], []).append(position)
+        self._index_text(table_name, pid, row)
+    
+    def _index_text(self, table_name, pid, row) -> None:
+        for column in self.text_indexes.get(table_name, {}):
+            index = self._index_for(table_name, column, pid, "text")
+            if index is not None and isinstance(row[column], str):
+                if row[column] not in index["values"]:
+                    bisect.insort(index["keys"], row[column])
+                self._text_index_add(index, row, row[column])
+    
+    def _unindex_text(self, table_name, pid, row) -> None:
+        """
+        Removes a row from the text indexes of its partition, dropping
+        values and tokens that no longer have any rows.
+        """
+        for column in self.text_indexes.get(table_name, {}):
+            index = self._index_for(table_name, column, pid, "text")
+            value = row[column]
+            if index is None or not isinstance(value, str):
+                continue
+            
+            rows = index["values"][value]
+            rows.pop(id(row), None)
+            if not rows:
+                del index["values"][value]
+                del index["keys"][bisect.bisect_left(index["keys"], value)]
+            for token in set(self._tokens(value)):
+                rows = index["tokens"][token]
+                rows.pop(id(row), None)
+                if not rows:
+                    del index["tokens"][token]
+    
+    def _text_index_add(self, index, row, value) -> None:
+        """
+        Adds a row to a text index's value and token postings. Postings hold
+        the rows themselves, keyed by id(), so deletes don't shift them.
+        """
+        index["values"].setdefault(value, {})[id(row)] = row
+        for token in self._tokens(value):
+            index["tokens"].setdefault(token, {})[id(row)] = row
+    
+    def _build_index(self, rows, column, kind="hash") -> dict:
+        if kind == "text":
+            index = {"values": {}, "tokens": {}}
+            for row in rows:
+                if isinstance(row[column], str):
+                    self._text_index_add(index, row, row[column])
+            index["keys"] = sorted(index["values"])
+            return index
+        
+        index = {}
+        for i, row in enumerate(rows):
+            index.setdefault(row[column], []).append(i)
+        return index
+    
+    def _rebuild_indexes(self, table_name, pid, kinds=INDEX_KINDS) -> None:
+        rows = self._partition(table_name, pid)["rows"]
+        for kind in kinds:
+            store = self._index_store(kind).get(table_name, {})
+            for column, index in store.items():
+                if pid is None:
+                    store[column] = self._build_index(rows, column, kind)
+                elif index[pid] is not None:
+                    index[pid] = self._build_index(rows, column, kind)
+        
+    def _compile_schema(self, schema: dict) -> dict:
+        """
+        Builds the per-table column set, validators and type checks used by
+        inserts, updates and where clauses.
+        """
+        validators = {}
+        checks = {}
+        for name, column in schema.items():
+            checks[name] = self._type_check(column["type"])
+            if checks[name] is not None or not column["nullable"]:
+                validators[name] = self._column_validator(name, column, checks[name])
+        
+        return {
+            "columns": frozenset(schema),
+            "validators": validators,
+            "checks": checks,
+            "unique": [name for name, column in schema.items() if column["unique"]],
+            # Generated ids are uuid strings, so typed id columns must be given a value.
+            "generate_id": "id" in schema and schema["id"]["type"] in (None, "TEXT")
+        }
+    
+    def _type_check(self, column_type):
+        if column_type is None:
+            return None
+        python_type = parser.COLUMN_TYPES[column_type]
+        if column_type == "BOOL":
+            return lambda value: isinstance(value, bool)
+        # bool is a subclass of int, so it has to be excluded explicitly.
+        return lambda value: isinstance(value, python_type) and not isinstance(value, bool)
+    
+    def _column_validator(self, name, column, check):
+        nullable = column["nullable"]
+        
+        def validate(value) -> None | ValueError | TypeError:
+            if value is None:
+                if column["primary_key"]:
+                    raise ValueError(f"Primary key column '{name}' needs a value")
+                if not nullable:
+                    raise ValueError(f"Column '{name}' cannot be null")
+            elif check is not None and not check(value):
+                raise TypeError(f"Column '{name}' expects {column['type']}")
+        return validate
+    
+    def _check_unique_update(self, table_name, set_values, matched) -> None | ValueError:
+        """
+        Rejects updates that would give two rows the same unique value.
+        """
+        for column in self.schemas[table_name]["unique"]:
+            value = set_values.get(column)
+            if value is None:
+                continue
+            if len(matched) > 1:
+                raise ValueError(f"Duplicate value for unique column '{column}'")
+            for _, row in matched:
+                target = self._partition_for_row(table_name, {**row, **set_values})
+                rows = self._partition(table_name, target)["rows"]
+                positions = self._index_for(table_name, column, target).get(value, [])
+                if any(rows[i] is not row for i in positions):
+                    raise ValueError(f"Duplicate value for unique column '{column}'")
+    
+    def _compile_where(self, table_name, where):
+        """
+        Turns a where clause into a row predicate. Compare values for typed
+        columns are checked once here instead of per row; untyped columns
+        are still checked against each row. LIKE and MATCH never match
+        values that aren't strings, the same as the text index.
+        """
+        if not where:
+            return None
+        
+        checks = self.schemas[table_name]["checks"] if table_name is not None else {}
+        conditions = []
+        for col, condition in where.items():
+            check = checks.get(col)
+            for op, value in condition.items():
+                compare = self._compile_operator(op, value)
+                if check is None and op in TEXT_OPERATORS:
+                    conditions.append(lambda row, col=col, compare=compare:
+                        isinstance(row[col], str) and compare(row[col]))
+                elif check is None:
+                    conditions.append(self._untyped_condition(col, compare, value))
+                elif not check(value):
+                    raise TypeError("Row value and compare value are not of the same type")
+                else:
+                    conditions.append(lambda row, col=col, compare=compare:
+                        row[col] is not None and compare(row[col]))
+        
+        return lambda row: all(condition(row) for condition in conditions)
+    
+    def _untyped_condition(self, col, compare, value):
+        def condition(row) -> bool | TypeError:
+            if not type(row[col]) == type(value):
+                raise TypeError("Row value and compare value are not of the same type")
+            return compare(row[col])
+        return condition
+    
+    def _compile_operator(self, op, value):
+        """
+        Returns a check for a single row value. LIKE supports '%' and '_'
+        wildcards, MATCH requires every word of the value to appear in the row.
+        """
+        if op in WHERE_OPERATORS:
+            compare = WHERE_OPERATORS[op]
+            return lambda row_value: compare(row_value, value)
+        if op not in TEXT_OPERATORS:
+            raise ValueError(f"Unsupported operator: {op}")
+        if not isinstance(value, str):
+            raise TypeError("LIKE and MATCH need a text value")
+        
+        if op == "like":
+            pattern = re.compile("".join(
+                ".*" if char == "%" else "." if char == "_" else re.escape(char) for char in value), re.DOTALL)
+            return lambda row_value: pattern.fullmatch(row_value) is not None
+        
+        words = set(self._tokens(value))
+        if not words:
+            raise ValueError("MATCH needs at least one word")
+        return lambda row_value: words <= set(self._tokens(row_value))
+    
     def _set_row_id(self, row: dict) -> dict:
         """
         Set row id for rows. Not included in parsed values.
@@ -300,17 +912,8 @@ class SimpleDB:
         """
         Checks if value (if comparable) is greater than ('gt'), less than ('lt'), or equal ('eq') to parsed value.
         """
-        for col, condition in where.items():
-            for op, value in condition.items():
-                if not type(row[col]) == type(value):
-                    raise TypeError("Row value and compare value are not of the same type")
-                elif op == "eq" and row[col] != value:
-                    return False
-                elif op == "gt" and row[col] <= value:
-                    return False
-                elif op == "lt" and row[col] >= value:
-                    return False
-        return True
+        matches = self._compile_where(None, where)
+        return not matches or matches(row)
     
     def _update_with_real_keys(self, temp_dict: dict, key_map: list) -> dict:
         """
@@ -1,7 +1,15 @@
 import re
 
+# Column type names and the Python values each accepts.
+COLUMN_TYPES = {
+    "INT": int,
+    "FLOAT": (int, float),
+    "TEXT": str,
+    "BOOL": bool
+}
+
 def parse_query(query_str):
-    pattern = r"'[^']*'|\"[^\"]*\"|\w+|[^\w\s,]"
+    pattern = r"'[^']*'|\"[^\"]*\"|[-+]?(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][-+]?\d+)?(?!\w)|\w+|[^\w\s,]"
     parts = re.findall(pattern, query_str)
     query = {}
     
@@ -16,22 +24,39 @@ def parse_query(query_str):
         
     return query
 
+def parse_literal(val: str):
+    """
+    Converts a literal from a query into a value: signed ints, floats,
+    TRUE/FALSE, NULL and 'quoted' strings. Anything else is kept as is.
+    """
+    if val.startswith("'") and val.endswith("'") and len(val) > 1:
+        return val[1:-1]
+    if re.fullmatch(r"[-+]?\d+", val):
+        return int(val)
+    if re.fullmatch(r"[-+]?(\d+\.\d*|\.\d+)([eE][-+]?\d+)?|[-+]?\d+[eE][-+]?\d+", val):
+        return float(val)
+    if val.upper() == "TRUE":
+        return True
+    if val.upper() == "FALSE":
+        return False
+    if val.upper() == "NULL":
+        return None
+    return val
+
 def get_where(parts: list[any], query: dict) -> None:
     if "WHERE" in parts:
             where_idx = parts.index('WHERE')
             col, op, val = parts[where_idx + 1], parts[where_idx + 2], parts[where_idx + 3]
-            val = int(val) if val.isdigit() else val
-            
-            if isinstance(val, str):
-                if val.startswith("'") and val.endswith("'"):
-                    val = val.strip("'")
+            val = parse_literal(val)
             
             op_map = {
                 '>': "gt",
                 '=': "eq",
-                '<': "lt"
+                '<': "lt",
+                'LIKE': "like",
+                'MATCH': "match"
                 }
-            query["where"][col] = {op_map[op]: val}
+            query["where"][col] = {op_map[op.upper()]: val}
 
 def select_query(parts: list, query: dict, query_str) -> list | dict:
     query["type"] = "SELECT"
@@ -70,14 +95,10 @@ def insert_query(parts: list, query: dict, query_str) -> dict:
     keys = lists[0]    
     values = lists[1:len(lists)]
     
-    values = [[int(val) if val.isdigit() else val for val in value_list] for value_list in values]
+    values = [[parse_literal(val) for val in value_list] for value_list in values]
     
     rows: list = []
     for value_list in values:
-        for i in range(len(value_list)):
-            if isinstance(value_list[i], str):
-                if value_list[i].startswith("'") and value_list[i].endswith("'"):
-                    value_list[i] = value_list[i].strip("'")
         if keys == []:
             rows.append({f"temp_{i}": value for i, value in enumerate(value_list)})
         else:
@@ -116,15 +137,44 @@ def update_query(parts: list, query: dict, query_str) -> dict:
         key = key.strip()
         value = value.strip()
         
-        value = int(value) if value.isdigit() else value
-        
-        if isinstance(value, str):
-            if value.startswith("'") and value.endswith("'"):
-                value = value.strip("'")
-
-            
-        values[key] = value
+        values[key] = parse_literal(value)
         
     query["values"] = values
     
-    return query
\ No newline at end of file
+    return query
+
+def parse_column(column_str: str) -> dict:
+    """
+    Parses a column declaration like "id INT PRIMARY KEY" or "name TEXT NOT NULL".
+    A bare name declares an untyped, nullable column.
+    """
+    parts = column_str.split()
+    if len(parts) == 0:
+        raise ValueError("Column declaration is empty")
+    
+    column = {"name": parts[0], "type": None, "nullable": True, "primary_key": False, "unique": False}
+    words = [part.upper() for part in parts[1:]]
+    
+    if words and words[0] in COLUMN_TYPES:
+        column["type"] = words.pop(0)
+    
+    explicit_null = False
+    while words:
+        if words[:2] == ["NOT", "NULL"] and not explicit_null:
+            column["nullable"] = False
+            words = words[2:]
+        elif words[:1] == ["NULL"] and column["nullable"]:
+            explicit_null = True
+            words = words[1:]
+        elif words[:2] == ["PRIMARY", "KEY"] and not explicit_null:
+            column["primary_key"] = True
+            column["unique"] = True
+            column["nullable"] = False
+            words = words[2:]
+        elif words[:1] == ["UNIQUE"]:
+            column["unique"] = True
+            words = words[1:]
+        else:
+            raise ValueError(f"Invalid column declaration: {column_str}")
+    
+    return column
@@ -1,5 +1,5 @@
 import pytest
-from src.parser import parse_query
+from src.parser import parse_query, parse_column, parse_literal
 
 class TestParser:
     def test_parse_select_query(self):
@@ -34,4 +34,59 @@ class TestParser:
         
         assert parsed["type"] == "DELETE"
         assert parsed["table"] == "users"
-        assert parsed["where"] == {"id": {"eq": 1}}
\ No newline at end of file
+        assert parsed["where"] == {"id": {"eq": 1}}
+    
+    def test_parse_column(self):
+        assert parse_column("name") == {"name": "name", "type": None, "nullable": True, "primary_key": False, "unique": False}
+        assert parse_column("id INT PRIMARY KEY") == {"name": "id", "type": "INT", "nullable": False, "primary_key": True, "unique": True}
+        assert parse_column("email text not null unique") == {"name": "email", "type": "TEXT", "nullable": False, "primary_key": False, "unique": True}
+        
+        assert parse_column("note TEXT NULL")["nullable"] == True
+        
+        with pytest.raises(ValueError) as e_info:
+            parse_column("age NUMBER")
+        assert str(e_info.value) == "Invalid column declaration: age NUMBER"
+        
+        with pytest.raises(ValueError) as e_info:
+            parse_column("id INT PRIMARY KEY NULL")
+        assert str(e_info.value) == "Invalid column declaration: id INT PRIMARY KEY NULL"
+        
+        with pytest.raises(ValueError) as e_info:
+            parse_column("x NOT NULL NULL")
+        assert str(e_info.value) == "Invalid column declaration: x NOT NULL NULL"
+        
+        with pytest.raises(ValueError) as e_info:
+            parse_column("x NULL NOT NULL")
+        assert str(e_info.value) == "Invalid column declaration: x NULL NOT NULL"
+        
+    def test_parse_like_and_match(self):
+        parsed = parse_query("SELECT name FROM users WHERE name LIKE 'Em%'")
+        assert parsed["where"] == {"name": {"like": "Em%"}}
+        
+        parsed = parse_query("DELETE FROM users WHERE name MATCH 'chen'")
+        assert parsed["where"] == {"name": {"match": "chen"}}
+        
+    def test_parse_literal(self):
+        assert parse_literal("42") == 42
+        assert parse_literal("-3") == -3
+        assert parse_literal("1.5") == 1.5
+        assert parse_literal("-0.25") == -0.25
+        assert parse_literal("2e3") == 2000.0
+        assert parse_literal("TRUE") is True
+        assert parse_literal("false") is False
+        assert parse_literal("NULL") is None
+        assert parse_literal("'12'") == "12"
+        assert parse_literal("Alice") == "Alice"
+        
+    def test_parse_typed_literals(self):
+        parsed = parse_query("INSERT INTO scores (id, score, active, note) VALUES (-3, 1.5, TRUE, NULL)")
+        assert parsed["values"] == [{"id": -3, "score": 1.5, "active": True, "note": None}]
+        
+        parsed = parse_query("SELECT id FROM scores WHERE score > 1.5")
+        assert parsed["where"] == {"score": {"gt": 1.5}}
+        
+        parsed = parse_query("DELETE FROM scores WHERE id = -3")
+        assert parsed["where"] == {"id": {"eq": -3}}
+        
+        parsed = parse_query("UPDATE scores SET score = -2.5, active = FALSE WHERE id = 1")
+        assert parsed["values"] == {"score": -2.5, "active": False}
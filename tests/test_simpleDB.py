@@ -175,4 +175,320 @@ class TestSimpleDB:
         assert len(rows) == number_of_threads * rows_per_thread
         expected_names = {f"name_{thread_id}_{i}" for thread_id in range(number_of_threads) for i in range(rows_per_thread)}
         actual_names = {row["name"] for row in rows}
-        assert expected_names == actual_names
\ No newline at end of file
+        assert expected_names == actual_names
+        
+    def test_create_partitioned_table(self, db):
+        db.create_table("users", ["id", "name", "age"], {"type": "hash", "column": "id", "count": 4})
+        
+        assert len(db.tables["users"]["partitions"]) == 4
+        assert "rows" not in db.tables["users"]
+        
+        db.create_table("people", ["id", "name", "age"], {"type": "range", "column": "age", "bounds": [18, 65]})
+        assert len(db.tables["people"]["partitions"]) == 3
+        
+        with pytest.raises(ValueError) as e_info:
+            db.create_table("bad", ["id"], {"type": "hash", "column": "age", "count": 2})
+        assert str(e_info.value) == "Partition column is not in table schema"
+        
+        with pytest.raises(ValueError) as e_info:
+            db.create_table("bad", ["id"], {"type": "list", "column": "id"})
+        assert str(e_info.value) == "Partition type must be 'hash' or 'range'"
+        
+    def test_hash_partitioned_table(self, db):
+        db.create_table("users", ["id", "name", "age"], {"type": "hash", "column": "id", "count": 4})
+        db.insert("users", [{"id": i, "name": f"user_{i}", "age": i} for i in range(20)])
+        
+        assert len(db.select("users", ["*"])) == 20
+        assert db.select("users", ["name"], {"id": {"eq": 7}}) == [{"name": "user_7"}]
+        assert sorted(row["id"] for row in db.select("users", ["id"], {"age": {"lt": 3}})) == [0, 1, 2]
+        
+        db.update("users", {"name": "updated"}, {"id": {"eq": 3}})
+        assert db.select("users", ["name"], {"id": {"eq": 3}}) == [{"name": "updated"}]
+        
+        db.update("users", {"id": 100}, {"id": {"eq": 4}})
+        assert db.select("users", ["name"], {"id": {"eq": 100}}) == [{"name": "user_4"}]
+        assert db.select("users", ["name"], {"id": {"eq": 4}}) == []
+        
+        db.delete("users", {"id": {"eq": 7}})
+        assert db.select("users", ["*"], {"id": {"eq": 7}}) == []
+        assert len(db.select("users", ["*"])) == 19
+        
+    def test_range_partitioned_table(self, db):
+        db.create_table("people", ["id", "name", "age"], {"type": "range", "column": "age", "bounds": [18, 65]})
+        db.insert("people", [{"id": 1, "name": "Kid", "age": 10},
+            {"id": 2, "name": "Adult", "age": 30},
+            {"id": 3, "name": "Senior", "age": 70}])
+        
+        assert db.select("people", ["name"], {"age": {"gt": 20}}) == [{"name": "Adult"}, {"name": "Senior"}]
+        assert db.select("people", ["name"], {"age": {"lt": 18}}) == [{"name": "Kid"}]
+        assert db.select("people", ["name"], {"age": {"gt": 20, "lt": 40}}) == [{"name": "Adult"}]
+        assert db.select("people", ["name"], {"age": {"eq": 65}}) == []
+        
+        db.update("people", {"age": 40}, {"id": {"eq": 1}})
+        assert db.select("people", ["name"], {"age": {"lt": 18}}) == []
+        assert db.select("people", ["name"], {"age": {"gt": 35, "lt": 65}}) == [{"name": "Kid"}]
+        
+        db.delete("people", {"age": {"gt": 65}})
+        assert db.select("people", ["name"]) == [{"name": "Adult"}, {"name": "Kid"}]
+        
+        with pytest.raises(ValueError) as e_info:
+            db.insert("people", [{"id": 4, "name": "Unknown"}])
+        assert str(e_info.value) == "Range partition column cannot be null"
+        
+    def test_failed_partition_update_leaves_rows_unchanged(self, db):
+        db.create_table("people", ["id", "name", "age"], {"type": "range", "column": "age", "bounds": [18, 65]})
+        db.insert("people", [{"id": 1, "name": "anna", "age": 10},
+            {"id": 2, "name": "bob", "age": 30}])
+        db.create_index("people", "name", "text")
+        
+        with pytest.raises(ValueError) as e_info:
+            db.update("people", {"age": None})
+        assert str(e_info.value) == "Range partition column cannot be null"
+        
+        with pytest.raises(TypeError) as e_info:
+            db.update("people", {"age": "x"}, {"id": {"eq": 2}})
+        assert str(e_info.value) == "Range partition value is not comparable with the bounds"
+        
+        assert db.select("people", ["id"], {"age": {"lt": 18}}) == [{"id": 1}]
+        assert db.select("people", ["age"], {"id": {"eq": 2}}) == [{"age": 30}]
+        assert db.select("people", ["id"], {"name": {"like": "a%"}}) == [{"id": 1}]
+        
+    def test_failed_autocommit_write_is_undone(self, db, monkeypatch):
+        db.create_table("users", ["id INT PRIMARY KEY", "name TEXT"])
+        db.insert("users", [{"id": 1, "name": "anna"}, {"id": 2, "name": "bob"}])
+        db.create_index("users", "name", "text")
+        
+        def fail(*args):
+            raise RuntimeError("Index write failed")
+        monkeypatch.setattr(db, "_index_text", fail)
+        
+        with pytest.raises(RuntimeError) as e_info:
+            db.update("users", {"name": "carl"})
+        assert str(e_info.value) == "Index write failed"
+        
+        with pytest.raises(RuntimeError) as e_info:
+            db.insert("users", [{"id": 3, "name": "dora"}])
+        assert str(e_info.value) == "Index write failed"
+        
+        monkeypatch.undo()
+        assert db.select("users", ["name"]) == [{"name": "anna"}, {"name": "bob"}]
+        assert db.select("users", ["id"], {"name": {"like": "b%"}}) == [{"id": 2}]
+        
+    def test_range_partition_ignores_count(self, db):
+        db.create_table("people", ["id", "age"], {"type": "range", "column": "age", "bounds": [18, 65], "count": 2})
+        db.insert("people", [{"id": 1, "age": 10}, {"id": 2, "age": 70}])
+        
+        assert db.select("people", ["id"], {"age": {"gt": 65}}) == [{"id": 2}]
+        assert len(db.select("people", ["*"])) == 2
+        
+    def test_hash_partition_numeric_values(self, db):
+        db.create_table("points", ["x FLOAT PRIMARY KEY", "label TEXT"], {"type": "hash", "column": "x", "count": 4})
+        db.insert("points", [{"x": 1, "label": "one"}, {"x": 2.5, "label": "two and a half"}])
+        
+        assert db.select("points", ["label"], {"x": {"eq": 1.0}}) == [{"label": "one"}]
+        assert db.select("points", ["label"], {"x": {"eq": 1}}) == [{"label": "one"}]
+        
+        with pytest.raises(ValueError) as e_info:
+            db.insert("points", [{"x": 1.0, "label": "duplicate"}])
+        assert str(e_info.value) == "Duplicate value for unique column 'x'"
+        
+    def test_partition_indexes(self, db):
+        db.create_table("users", ["id", "name", "age"], {"type": "hash", "column": "id", "count": 3})
+        db.insert("users", [{"id": i, "name": f"user_{i % 5}", "age": i} for i in range(15)])
+        db.create_index("users", "name")
+        
+        assert len(db.indexes["users"]["name"]) == 3
+        assert len(db.select("users", ["*"], {"name": {"eq": "user_2"}})) == 3
+        
+        db.insert("users", [{"id": 15, "name": "user_2", "age": 15}])
+        db.delete("users", {"id": {"eq": 2}})
+        assert sorted(row["id"] for row in db.select("users", ["*"], {"name": {"eq": "user_2"}})) == [7, 12, 15]
+        
+    def test_concurrent_partition_writes(self, db):
+        number_of_threads = 4
+        rows_per_thread = 50
+        
+        db.create_table("test_table", ["id", "name", "value"], {"type": "range", "column": "value", "bounds": [1, 2, 3]})
+        
+        def insert_rows(thread_id):
+            for i in range(rows_per_thread):
+                db.begin_transaction()
+                db.insert("test_table", [{"name": f"name_{thread_id}_{i}", "value": thread_id}])
+                db.commit()
+        
+        threads = [threading.Thread(target=insert_rows, args=(i,)) for i in range(number_of_threads)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+            
+        assert [len(p["rows"]) for p in db.tables["test_table"]["partitions"]] == [rows_per_thread] * number_of_threads
+        assert len(db.select("test_table", ["*"], {"value": {"eq": 2}})) == rows_per_thread
+        
+        with open(db.db_file, 'r') as f:
+            saved = json.load(f)
+        assert [len(p["rows"]) for p in saved["test_table"]["partitions"]] == [rows_per_thread] * number_of_threads
+        
+    def test_typed_schema(self, db):
+        db.create_table("users", ["id INT PRIMARY KEY", "name TEXT NOT NULL", "score FLOAT", "active BOOL"])
+        
+        assert db.tables["users"]["columns"] == ["id", "name", "score", "active"]
+        assert db.tables["users"]["schema"]["id"] == {"type": "INT", "nullable": False, "primary_key": True, "unique": True}
+        assert db.indexes["users"] == {"id": {}}
+        
+        db.insert("users", [{"id": 1, "name": "Alice", "score": 1.5, "active": True},
+            {"id": 2, "name": "Bob", "score": 3}])
+        assert db.select("users", ["name"], {"score": {"gt": 2}}) == [{"name": "Bob"}]
+        
+        with pytest.raises(TypeError) as e_info:
+            db.insert("users", [{"id": "3", "name": "Charlie"}])
+        assert str(e_info.value) == "Column 'id' expects INT"
+        
+        with pytest.raises(TypeError) as e_info:
+            db.insert("users", [{"id": 3, "name": "Charlie", "active": 1}])
+        assert str(e_info.value) == "Column 'active' expects BOOL"
+        
+        with pytest.raises(ValueError) as e_info:
+            db.insert("users", [{"id": 3}])
+        assert str(e_info.value) == "Column 'name' cannot be null"
+        
+        with pytest.raises(ValueError) as e_info:
+            db.insert("users", [{"name": "Charlie"}])
+        assert str(e_info.value) == "Primary key column 'id' needs a value"
+        
+        db.create_table("notes", ["id TEXT PRIMARY KEY", "body TEXT"])
+        db.insert("notes", [{"body": "generated id"}])
+        assert isinstance(db.select("notes", ["id"])[0]["id"], str)
+        
+        with pytest.raises(TypeError) as e_info:
+            db.select("users", ["*"], {"id": {"eq": "1"}})
+        assert str(e_info.value) == "Row value and compare value are not of the same type"
+        
+        with pytest.raises(TypeError) as e_info:
+            db.update("users", {"score": "high"}, {"id": {"eq": 1}})
+        assert str(e_info.value) == "Column 'score' expects FLOAT"
+        
+        with pytest.raises(ValueError) as e_info:
+            db.create_table("bad", ["id INT PRIMARY KEY", "code INT PRIMARY KEY"])
+        assert str(e_info.value) == "Table can only have one primary key"
+        
+    def test_typed_execute(self, db):
+        db.create_table("scores", ["id INT PRIMARY KEY", "score FLOAT", "active BOOL"])
+        db.execute("INSERT INTO scores (id, score, active) VALUES (-3, 1.5, TRUE), (2, 2, FALSE)")
+        
+        assert db.execute("SELECT id FROM scores WHERE score > 1.5") == [{"id": 2}]
+        assert db.execute("SELECT score FROM scores WHERE id = -3") == [{"score": 1.5}]
+        
+        db.execute("UPDATE scores SET active = TRUE WHERE id = 2")
+        assert db.select("scores", ["active"], {"id": {"eq": 2}}) == [{"active": True}]
+        
+    def test_unique_constraints(self, db):
+        db.create_table("users", ["id INT PRIMARY KEY", "email TEXT UNIQUE"])
+        db.insert("users", [{"id": 1, "email": "a@test.com"}, {"id": 2}, {"id": 3}])
+        
+        with pytest.raises(ValueError) as e_info:
+            db.insert("users", [{"id": 1, "email": "b@test.com"}])
+        assert str(e_info.value) == "Duplicate value for unique column 'id'"
+        
+        with pytest.raises(ValueError) as e_info:
+            db.insert("users", [{"id": 4, "email": "c@test.com"}, {"id": 5, "email": "c@test.com"}])
+        assert str(e_info.value) == "Duplicate value for unique column 'email'"
+        assert len(db.select("users", ["*"])) == 3
+        
+        with pytest.raises(ValueError) as e_info:
+            db.update("users", {"email": "a@test.com"}, {"id": {"eq": 2}})
+        assert str(e_info.value) == "Duplicate value for unique column 'email'"
+        
+        db.update("users", {"email": "a@test.com"}, {"id": {"eq": 1}})
+        db.delete("users", {"id": {"eq": 1}})
+        db.insert("users", [{"id": 1, "email": "a@test.com"}])
+        assert db.select("users", ["email"], {"id": {"eq": 1}}) == [{"email": "a@test.com"}]
+        
+        db.begin_transaction()
+        db.insert("users", [{"id": 4, "email": "d@test.com"}])
+        db.update("users", {"email": "e@test.com"}, {"id": {"eq": 3}})
+        db.delete("users", {"id": {"eq": 1}})
+        db.insert("users", [{"id": 3}])
+        with pytest.raises(ValueError) as e_info:
+            db.commit()
+        assert str(e_info.value) == "Duplicate value for unique column 'id'"
+        assert sorted(row["id"] for row in db.select("users", ["id"])) == [1, 2, 3]
+        assert db.select("users", ["email"], {"id": {"eq": 3}}) == [{"email": None}]
+        assert db.select("users", ["id"], {"email": {"eq": "d@test.com"}}) == []
+        assert db.select("users", ["id"], {"email": {"eq": "a@test.com"}}) == [{"id": 1}]
+        
+        with pytest.raises(ValueError) as e_info:
+            db.create_table("bad", ["id INT PRIMARY KEY", "age INT"], {"type": "range", "column": "age", "bounds": [18]})
+        assert str(e_info.value) == "Unique columns of a partitioned table must be the partition column"
+        
+    def test_like_and_match(self, db):
+        db.create_table("users", ["id INT PRIMARY KEY", "name TEXT", "age INT"])
+        db.insert("users", [{"id": 1, "name": "Emily Chen", "age": 29},
+            {"id": 2, "name": "Emma Stone", "age": 35},
+            {"id": 3, "name": "Ethan Kim", "age": 36},
+            {"id": 4, "name": "Wei chen", "age": 41}])
+        
+        assert db.select("users", ["id"], {"name": {"like": "Em%"}}) == [{"id": 1}, {"id": 2}]
+        assert db.select("users", ["id"], {"name": {"like": "E_han%"}}) == [{"id": 3}]
+        assert db.select("users", ["id"], {"name": {"like": "%Kim"}}) == [{"id": 3}]
+        assert db.select("users", ["id"], {"name": {"match": "CHEN"}}) == [{"id": 1}, {"id": 4}]
+        assert db.execute("SELECT id FROM users WHERE name LIKE 'Emma%'") == [{"id": 2}]
+        
+        with pytest.raises(TypeError) as e_info:
+            db.select("users", ["*"], {"age": {"like": "3%"}})
+        assert str(e_info.value) == "Row value and compare value are not of the same type"
+        
+    def test_text_index(self, db):
+        for table_name in ["indexed", "plain"]:
+            db.create_table(table_name, ["id INT PRIMARY KEY", "name", "age INT"], {"type": "hash", "column": "id", "count": 2})
+            db.insert(table_name, [{"id": 1, "name": "Emily Chen", "age": 29},
+                {"id": 2, "name": "Emma Stone", "age": 35},
+                {"id": 3, "name": "Ethan Kim", "age": 36},
+                {"id": 5, "age": 50},
+                {"id": 6, "name": 7, "age": 60}])
+        db.create_index("indexed", "name", "text")
+        
+        def names(table_name, where):
+            return sorted(row["name"] for row in db.select(table_name, ["name"], where))
+        
+        for where in [{"name": {"like": "Em%"}}, {"name": {"match": "kim"}}, {"name": {"like": "%"}}]:
+            assert names("indexed", where) == names("plain", where)
+        
+        wheres = [{"name": {"like": "Em%"}},
+            {"name": {"like": "Emma Stone"}},
+            {"name": {"like": "E_han%"}},
+            {"name": {"match": "chen"}},
+            {"name": {"match": "emilia chen"}}]
+        
+        assert names("indexed", wheres[0]) == ["Emily Chen", "Emma Stone"]
+        assert names("indexed", wheres[1]) == ["Emma Stone"]
+        
+        for table_name in ["indexed", "plain"]:
+            db.insert(table_name, [{"id": 4, "name": "Wei Chen", "age": 41}])
+            db.update(table_name, {"name": "Emilia Chen"}, {"id": {"eq": 1}})
+            db.update(table_name, {"id": 10}, {"id": {"eq": 3}})
+            db.delete(table_name, {"id": {"eq": 2}})
+        
+        assert names("indexed", wheres[3]) == ["Emilia Chen", "Wei Chen"]
+        assert names("indexed", wheres[4]) == ["Emilia Chen"]
+        assert names("indexed", wheres[0]) == ["Emilia Chen"]
+        assert names("indexed", {"name": {"like": "Ethan%"}}) == ["Ethan Kim"]
+        for where in wheres:
+            assert names("indexed", where) == names("plain", where)
+        
+        db.delete("indexed", {"name": {"match": "chen"}})
+        assert names("indexed", wheres[3]) == []
+        assert names("indexed", {"name": {"like": "%"}}) == ["Ethan Kim"]
+        
+        for table_name in ["indexed", "plain"]:
+            with pytest.raises(ValueError) as e_info:
+                db.select(table_name, ["*"], {"name": {"match": "!!"}})
+            assert str(e_info.value) == "MATCH needs at least one word"
+        
+        with pytest.raises(ValueError) as e_info:
+            db.create_index("indexed", "age", "text")
+        assert str(e_info.value) == "Text indexes need a TEXT or untyped column"
+        
+        with pytest.raises(ValueError) as e_info:
+            db.create_index("indexed", "name", "btree")
+        assert str(e_info.value) == "Index kind must be one of hash, text"